@@ -1,7 +1,8 @@
+import asyncio
 import logging
 import json
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Literal, Optional
 
 from dotenv import load_dotenv
 from livekit.agents import (
@@ -25,11 +26,14 @@ logger = logging.getLogger("agent")
 
 load_dotenv(".env.local")
 
+# Stateless config; each TTS stream gets its own buffer from .stream()
+_SENTENCE_TOKENIZER = tokenize.basic.SentenceTokenizer(min_sentence_len=2)
 
-class BaristaAssistant(Agent):
-    def __init__(self) -> None:
-        super().__init__(
-            instructions="""You are a friendly and enthusiastic barista at Brew & Bean Coffee Shop. The user is interacting with you via voice.
+# Closed choices for save_order; function_tool exposes these as JSON-schema enums
+DrinkSize = Literal["small", "medium", "large"]
+MilkOption = Literal["whole", "skim", "oat", "almond", "soy", "none"]
+
+_BARISTA_INSTRUCTIONS = """You are a friendly and enthusiastic barista at Brew & Bean Coffee Shop. The user is interacting with you via voice.
             
             Your job is to take coffee orders and gather all necessary information:
             - Drink type (e.g., latte, cappuccino, espresso, americano, cold brew, mocha)
@@ -44,7 +48,19 @@ class BaristaAssistant(Agent):
             When the customer confirms, use the save_order tool to save their order.
             
             Keep responses concise and natural, without complex formatting, emojis, or asterisks.
-            Be helpful and make the ordering experience delightful.""",
+            Be helpful and make the ordering experience delightful."""
+
+
+def _append_order(filename: str, order: dict) -> None:
+    """Append one order as a JSON line (blocking; run it off the event loop)."""
+    with open(filename, 'a') as f:
+        f.write(json.dumps(order, separators=(",", ":")) + "\n")
+
+
+class BaristaAssistant(Agent):
+    def __init__(self) -> None:
+        super().__init__(
+            instructions=_BARISTA_INSTRUCTIONS,
         )
         
         # Initialize order state
@@ -59,8 +75,8 @@ class BaristaAssistant(Agent):
     @function_tool
     async def save_order(self, context: RunContext, 
                         drink_type: str, 
-                        size: str, 
-                        milk: str, 
+                        size: DrinkSize, 
+                        milk: MilkOption, 
                         extras: str,
                         name: str):
         """Save the completed coffee order to a JSON file.
@@ -86,36 +102,23 @@ class BaristaAssistant(Agent):
             "milk": milk,
             "extras": extras_list,
             "name": name,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "status": "confirmed"
         }
         
-        # Save to single JSON file (append to existing orders)
-        filename = "orders.json"
+        # Append to a JSON Lines file (one order per line)
+        filename = "orders.jsonl"
         
         try:
-            # Read existing orders
-            try:
-                with open(filename, 'r') as f:
-                    orders = json.load(f)
-            except FileNotFoundError:
-                # File doesn't exist yet, start with empty list
-                orders = []
-            
-            # Append new order
-            orders.append(order)
-            
-            # Write all orders back to file
-            with open(filename, 'w') as f:
-                json.dump(orders, f, indent=2)
+            await asyncio.to_thread(_append_order, filename, order)
             
-            logger.info(f"Order saved successfully to {filename}")
-            logger.info(f"Order details: {json.dumps(order, indent=2)}")
+            logger.info("Order saved successfully to %s", filename)
+            logger.info("Order details: %s", order)
             
             return f"Perfect! Your order has been saved. Your {size} {drink_type} with {milk} milk will be ready soon, {name}. Thanks for choosing Brew & Bean!"
             
         except Exception as e:
-            logger.error(f"Error saving order: {e}")
+            logger.error("Error saving order: %s", e)
             return f"I've noted your order, but there was a technical issue saving it. Don't worry, I'll make sure your {size} {drink_type} gets made!"
 
 
@@ -136,7 +139,7 @@ async def entrypoint(ctx: JobContext):
         tts=murf.TTS(
             voice="en-US-matthew", 
             style="Conversation",
-            tokenizer=tokenize.basic.SentenceTokenizer(min_sentence_len=2),
+            tokenizer=_SENTENCE_TOKENIZER,
             text_pacing=True
         ),
         turn_detection=MultilingualModel(),
@@ -154,7 +157,7 @@ async def entrypoint(ctx: JobContext):
 
     async def log_usage():
         summary = usage_collector.get_summary()
-        logger.info(f"Usage: {summary}")
+        logger.info("Usage: %s", summary)
 
     ctx.add_shutdown_callback(log_usage)
 